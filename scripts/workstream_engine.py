@@ -15,110 +15,220 @@ Exit codes: 0 success, 1 no tickets available, 2 error
 
 import argparse
 import json
+import os
 import re
 import sys
-from collections import defaultdict
+from bisect import bisect_left, insort
+from collections import Counter, defaultdict, deque
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+try:
+    import orjson
+except ImportError:  # optional accelerator; stdlib json is the fallback
+    orjson = None
+
 STATUS_DIR = Path(".claude/workstreams")
 STATUS_FILE = STATUS_DIR / "status.json"
 VALID_STATUSES = ("pending", "in_progress", "done", "blocked")
 PRIORITY_ORDER = {"critical": 0, "high": 1, "medium": 2, "low": 3}
+WRITE_BUFFER_SIZE = 1 << 20
+INTERNED_FIELDS = ("status", "priority", "area", "plan_status", "build_status")
+
+# (mtime_ns, size) of status.json and its parsed contents, shared by in-process callers
+_status_cache: tuple[tuple[int, int], dict[str, Any]] | None = None
+
+# Pattern: ## PROJ-101: Summary
+_HEADER_RE = re.compile(r"^#{2,3}\s+([A-Z]+-\d+)[:\s]+(.+)$", re.MULTILINE)
+_PRI_RE = re.compile(r"priority:\s*(critical|high|medium|low)", re.I)
+_DEP_RE = re.compile(r"blocked_by:\s*\[([^\]]*)\]")
+_AREA_RE = re.compile(r"area:\s*(\w+)", re.I)
+_H2_RE = re.compile(r"^##\s+(.+)$", re.MULTILINE)
 
 
 def timestamp() -> str:
     return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
 
 
+def _stat_key() -> tuple[int, int]:
+    st = STATUS_FILE.stat()
+    return st.st_mtime_ns, st.st_size
+
+
+def _intern_status(data: dict[str, Any]) -> None:
+    """Share one str object per ticket ID and status literal across the loaded state."""
+    intern = sys.intern
+    tickets: dict[str, Any] = {}
+    for tid, info in data.get("tickets", {}).items():
+        for field in INTERNED_FIELDS:
+            value = info.get(field)
+            if isinstance(value, str):
+                info[field] = intern(value)
+        for field in ("blocked_by", "blocks"):
+            if info.get(field):
+                info[field] = [intern(t) for t in info[field]]
+        tickets[intern(tid)] = info
+    data["tickets"] = tickets
+    graph = data.get("dependency_graph")
+    if graph:
+        data["dependency_graph"] = {intern(t): [intern(d) for d in deps] for t, deps in graph.items()}
+
+
 def load_status() -> dict[str, Any]:
-    if STATUS_FILE.exists():
-        return json.loads(STATUS_FILE.read_text())
-    return {"version": "1.0", "created": timestamp(), "project": "",
-            "workstreams": {}, "tickets": {}, "phases": {},
-            "critical_path": [], "dependency_graph": {}}
+    """Load status.json, reusing the parsed state while the file is unchanged on disk."""
+    global _status_cache
+    if not STATUS_FILE.exists():
+        return {"version": "1.0", "created": timestamp(), "project": "",
+                "workstreams": {}, "tickets": {}, "phases": {},
+                "critical_path": [], "dependency_graph": {}}
+    key = _stat_key()
+    if _status_cache is not None and _status_cache[0] == key:
+        return _status_cache[1]
+    if orjson is not None:
+        data = orjson.loads(STATUS_FILE.read_bytes())
+    else:
+        data = json.loads(STATUS_FILE.read_text(encoding="utf-8"))
+    _intern_status(data)
+    _status_cache = (key, data)
+    return data
 
 
 def save_status(data: dict[str, Any]) -> None:
+    global _status_cache
     STATUS_DIR.mkdir(parents=True, exist_ok=True)
     tmp = STATUS_FILE.with_suffix(".tmp")
-    tmp.write_text(json.dumps(data, indent=2) + "\n")
-    tmp.rename(STATUS_FILE)
-
-
-def detect_cycle(graph: dict[str, list[str]]) -> list[str] | None:
-    """Return cycle path if one exists, else None."""
-    WHITE, GRAY, BLACK = 0, 1, 2
-    color: dict[str, int] = {n: WHITE for n in graph}
-    parent: dict[str, str | None] = {n: None for n in graph}
-
-    def dfs(node: str) -> list[str] | None:
-        color[node] = GRAY
-        for dep in graph.get(node, []):
-            if dep not in color:
-                continue
-            if color[dep] == GRAY:
-                cycle = [dep, node]
-                cur = node
-                while cur != dep:
-                    cur = parent[cur]  # type: ignore[assignment]
-                    if cur is None:
-                        break
-                    cycle.append(cur)
-                cycle.reverse()
-                return cycle
-            if color[dep] == WHITE:
+    if orjson is not None:
+        with open(tmp, "wb", buffering=WRITE_BUFFER_SIZE) as fh:
+            fh.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
+            fh.flush()
+            os.fsync(fh.fileno())
+    else:
+        with open(tmp, "w", encoding="utf-8", buffering=WRITE_BUFFER_SIZE) as fh:
+            # json.dump encodes chunk by chunk into the file instead of building one string
+            json.dump(data, fh, indent=2)
+            fh.write("\n")
+            fh.flush()
+            os.fsync(fh.fileno())
+    os.replace(tmp, STATUS_FILE)
+    _status_cache = (_stat_key(), data)
+
+
+def analyze_graph(graph: dict[str, list[str]]) -> tuple[list[str] | None, dict[str, int], dict[str, list[str]]]:
+    """Single Kahn pass returning (cycle, depths, phases). Depths and phases are empty on a cycle.
+
+    Depth 0 = no dependencies; phase N holds the tickets at depth N-1.
+    """
+    pending: dict[str, int] = {n: 0 for n in graph}
+    rev: dict[str, list[str]] = defaultdict(list)
+    for node, deps in graph.items():
+        for dep in deps:
+            if dep in pending:
+                pending[node] += 1
+                rev[dep].append(node)
+    depth: dict[str, int] = dict.fromkeys(graph, 0)
+    queue = deque(n for n, count in pending.items() if count == 0)
+    while queue:
+        node = queue.popleft()
+        d = depth[node] + 1
+        for succ in rev[node]:
+            if depth[succ] < d:
+                depth[succ] = d
+            pending[succ] -= 1
+            if pending[succ] == 0:
+                queue.append(succ)
+    remaining = {n for n, count in pending.items() if count}
+    if remaining:
+        return _find_cycle(graph, remaining), {}, {}
+
+    buckets: dict[int, list[str]] = defaultdict(list)
+    for ticket, d in depth.items():
+        buckets[d].append(ticket)
+    phases = {str(k + 1): sorted(v) for k, v in sorted(buckets.items())}
+    return None, depth, phases
+
+
+def _find_cycle(graph: dict[str, list[str]], remaining: set[str]) -> list[str]:
+    # Every ticket Kahn could not drain has an undrained dependency; follow those until one repeats.
+    node = next(n for n in graph if n in remaining)
+    path: list[str] = []
+    seen: dict[str, int] = {}
+    while node not in seen:
+        seen[node] = len(path)
+        path.append(node)
+        node = next(d for d in graph[node] if d in remaining)
+    return path[seen[node]:] + [node]
+
+
+def _dependency_path(graph: dict[str, list[str]], start: str, target: str) -> list[str] | None:
+    """Dependency chain from start down to target, or None if target is not reachable."""
+    parent: dict[str, str | None] = {start: None}
+    stack = [start]
+    while stack:
+        node = stack.pop()
+        if node == target:
+            path: list[str] = []
+            while node is not None:
+                path.append(node)
+                node = parent[node]
+            return path[::-1]
+        for dep in graph[node]:
+            if dep in graph and dep not in parent:
                 parent[dep] = node
-                result = dfs(dep)
-                if result is not None:
-                    return result
-        color[node] = BLACK
-        return None
-
-    for node in graph:
-        if color[node] == WHITE:
-            result = dfs(node)
-            if result is not None:
-                return result
+                stack.append(dep)
     return None
 
 
-def compute_depth(graph: dict[str, list[str]]) -> dict[str, int]:
-    """Dependency depth per ticket. Depth 0 = no dependencies."""
-    depth: dict[str, int] = {}
-    def get(node: str) -> int:
-        if node in depth:
-            return depth[node]
-        deps = [d for d in graph.get(node, []) if d in graph]
-        depth[node] = 0 if not deps else 1 + max(get(d) for d in deps)
-        return depth[node]
-    for node in graph:
-        get(node)
-    return depth
-
+def _raise_depths(data: dict[str, Any], ticket_id: str, depth: int) -> None:
+    """Raise ticket_id to at least depth and push the increase through its dependents.
 
-def compute_phases(graph: dict[str, list[str]]) -> dict[str, list[str]]:
-    depths = compute_depth(graph)
-    phases: dict[int, list[str]] = defaultdict(list)
-    for ticket, d in depths.items():
-        phases[d].append(ticket)
-    return {str(k + 1): sorted(v) for k, v in sorted(phases.items())}
+    A new edge can only deepen the graph, so propagation stops at tickets whose
+    depth does not change; phase buckets are patched in place for moved tickets.
+    Dependents come from dependency_graph, since "blocks" lists can lag behind it
+    after a re-create.
+    """
+    tickets, graph, phases = data["tickets"], data["dependency_graph"], data["phases"]
+    dependents: dict[str, list[str]] = defaultdict(list)
+    for tid, deps in graph.items():
+        for dep in deps:
+            dependents[dep].append(tid)
+    moved = False
+    queue = deque([(ticket_id, depth)])
+    while queue:
+        node, d = queue.popleft()
+        info = tickets[node]
+        old = info.get("depth", 0)
+        if d <= old:
+            continue
+        bucket = phases.get(str(old + 1), [])
+        i = bisect_left(bucket, node)
+        if i < len(bucket) and bucket[i] == node:
+            del bucket[i]
+            if not bucket:
+                del phases[str(old + 1)]
+        insort(phases.setdefault(str(d + 1), []), node)
+        info["depth"] = d
+        info["phase"] = d + 1
+        moved = True
+        for succ in dependents.get(node, ()):
+            queue.append((succ, d + 1))
+    if moved:
+        data["phases"] = dict(sorted(phases.items(), key=lambda kv: int(kv[0])))
 
 
 def parse_source_file(path: Path) -> list[dict[str, Any]]:
     """Extract tickets from a PRD/plan markdown file."""
     content = path.read_text()
     tickets: list[dict[str, Any]] = []
-    # Pattern: ## PROJ-101: Summary
-    matches = list(re.finditer(r"^#{2,3}\s+([A-Z]+-\d+)[:\s]+(.+)$", content, re.MULTILINE))
+    matches = list(_HEADER_RE.finditer(content))
     if matches:
-        for i, m in enumerate(matches):
-            end = matches[i + 1].start() if i + 1 < len(matches) else len(content)
-            body = content[m.end():end]
-            pri = re.search(r"priority:\s*(critical|high|medium|low)", body, re.I)
-            dep = re.search(r"blocked_by:\s*\[([^\]]*)\]", body)
-            area = re.search(r"area:\s*(\w+)", body, re.I)
+        ends = [m.start() for m in matches[1:]] + [len(content)]
+        for m, end in zip(matches, ends):
+            # Search the ticket's span in place rather than slicing out each body
+            start = m.end()
+            pri = _PRI_RE.search(content, start, end)
+            dep = _DEP_RE.search(content, start, end)
+            area = _AREA_RE.search(content, start, end)
             blocked = [b.strip().strip("'\"") for b in dep.group(1).split(",") if b.strip()] if dep else []
             tickets.append({"id": m.group(1), "summary": m.group(2).strip(),
                             "area": area.group(1) if area else "",
@@ -128,7 +238,7 @@ def parse_source_file(path: Path) -> list[dict[str, Any]]:
         # Fallback: treat each H2 as a ticket
         skip = {"overview", "introduction", "summary", "references", "appendix", "changelog", "table of contents"}
         prefix = path.stem.upper()[:4]
-        for i, m in enumerate(re.finditer(r"^##\s+(.+)$", content, re.MULTILINE)):
+        for i, m in enumerate(_H2_RE.finditer(content)):
             if m.group(1).strip().lower() in skip:
                 continue
             tickets.append({"id": f"{prefix}-{(i + 1) * 100 + 1}", "summary": m.group(1).strip(),
@@ -145,17 +255,21 @@ def cmd_create(source_file: str) -> int:
     if not tickets:
         print(f"Error: No tickets found in {source_file}", file=sys.stderr)
         return 2
-    ids = [t["id"] for t in tickets]
-    dupes = set(tid for tid in ids if ids.count(tid) > 1)
+    counts = Counter(t["id"] for t in tickets)
+    dupes = [tid for tid, count in counts.items() if count > 1]
     if dupes:
         print(f"Error: Duplicate ticket IDs: {', '.join(dupes)}", file=sys.stderr)
         return 2
 
+    graph: dict[str, list[str]] = {t["id"]: t["blocked_by"] for t in tickets}
+    cycle, depths, phases = analyze_graph(graph)
+    if cycle:
+        print(f"Error: Dependency cycle detected: {' -> '.join(cycle)}", file=sys.stderr)
+        return 2
+
     data = load_status()
     data["created"] = timestamp()
-    graph: dict[str, list[str]] = {}
     for t in tickets:
-        graph[t["id"]] = t["blocked_by"]
         data["tickets"][t["id"]] = {
             "summary": t["summary"], "area": t["area"], "workstream": "",
             "phase": 1, "depth": 0, "status": "pending", "priority": t["priority"],
@@ -163,22 +277,22 @@ def cmd_create(source_file: str) -> int:
             "plan_status": "none", "build_status": "none",
             "pr_number": None, "pr_status": None, "retry_count": 0}
 
-    cycle = detect_cycle(graph)
-    if cycle:
-        print(f"Error: Dependency cycle detected: {' -> '.join(cycle)}", file=sys.stderr)
-        return 2
-    # Compute reverse deps, depths, phases
+    # Compute reverse deps with set membership, keeping first-seen order
+    reverse: dict[str, dict[str, None]] = defaultdict(dict)
     for tid, deps in graph.items():
         for dep in deps:
-            if dep in data["tickets"] and tid not in data["tickets"][dep]["blocks"]:
-                data["tickets"][dep]["blocks"].append(tid)
-    depths = compute_depth(graph)
+            if dep in data["tickets"]:
+                reverse[dep][tid] = None
+    for dep, tids in reverse.items():
+        blocks = data["tickets"][dep]["blocks"]
+        existing = set(blocks)
+        blocks.extend(tid for tid in tids if tid not in existing)
     for tid, d in depths.items():
         if tid in data["tickets"]:
             data["tickets"][tid]["depth"] = d
             data["tickets"][tid]["phase"] = d + 1
     data["dependency_graph"] = dict(graph)
-    data["phases"] = compute_phases(graph)
+    data["phases"] = phases
     save_status(data)
 
     print(f"Created {len(tickets)} tickets from {source_file}")
@@ -199,25 +313,29 @@ def cmd_status() -> int:
         return 1
 
     by_phase: dict[int, list[tuple[str, dict]]] = defaultdict(list)
+    status_counts: Counter[str] = Counter()
     for tid, info in tickets.items():
         by_phase[info.get("phase", 1)].append((tid, info))
+        status_counts[info.get("status")] += 1
 
-    print("Workstream Status")
-    print("=" * 70)
+    header = f"  {'Ticket':<14} {'Summary':<30} {'Status':<12} {'Build':<10} {'Blocked By'}"
+    lines = ["Workstream Status", "=" * 70]
     for p in sorted(by_phase):
-        print(f"\nPhase {p}")
-        print(f"  {'Ticket':<14} {'Summary':<30} {'Status':<12} {'Build':<10} {'Blocked By'}")
+        lines.append(f"\nPhase {p}")
+        lines.append(header)
         for tid, info in sorted(by_phase[p]):
-            print(f"  {tid:<14} {info.get('summary','')[:28]:<30} {info.get('status','pending'):<12} "
-                  f"{info.get('build_status','none'):<10} {', '.join(info.get('blocked_by',[])) or '--'}")
+            get = info.get
+            lines.append(f"  {tid:<14} {get('summary', '')[:28]:<30} {get('status', 'pending'):<12} "
+                         f"{get('build_status', 'none'):<10} {', '.join(get('blocked_by', [])) or '--'}")
 
     total = len(tickets)
-    done = sum(1 for t in tickets.values() if t.get("status") == "done")
-    prog = sum(1 for t in tickets.values() if t.get("status") == "in_progress")
-    print(f"\nSummary: {total} tickets | {done} done | {prog} in-progress | {total - done - prog} pending")
+    done = status_counts["done"]
+    prog = status_counts["in_progress"]
+    lines.append(f"\nSummary: {total} tickets | {done} done | {prog} in-progress | {total - done - prog} pending")
     crit = data.get("critical_path", [])
     if crit:
-        print(f"Critical path: {' -> '.join(crit)}")
+        lines.append(f"Critical path: {' -> '.join(crit)}")
+    sys.stdout.write("\n".join(lines) + "\n")
     return 0
 
 
@@ -230,23 +348,32 @@ def cmd_next() -> int:
         print("No tickets available.", file=sys.stderr)
         return 1
 
-    candidates = []
-    for tid, info in tickets.items():
-        if info.get("status") != "pending":
-            continue
-        if all(tickets.get(d, {}).get("status") == "done" for d in info.get("blocked_by", [])):
-            candidates.append((tid, info))
-    if not candidates:
+    # Ticket IDs are unique, so tuple comparison never reaches the info dict
+    best = min(
+        ((PRIORITY_ORDER.get(info.get("priority", "medium"), 2), info.get("phase", 999), tid, info)
+         for tid, info in tickets.items()
+         if info.get("status") == "pending"
+         and all(tickets.get(d, {}).get("status") == "done" for d in info.get("blocked_by", []))),
+        default=None)
+    if best is None:
         print("No unblocked tickets available.", file=sys.stderr)
         return 1
 
-    candidates.sort(key=lambda x: (PRIORITY_ORDER.get(x[1].get("priority", "medium"), 2),
-                                    x[1].get("phase", 999), x[0]))
-    tid, info = candidates[0]
-    print(json.dumps({"ticket": tid, "summary": info.get("summary", ""),
-                       "priority": info.get("priority", "medium"),
-                       "phase": info.get("phase", 1),
-                       "blocked_by": info.get("blocked_by", [])}, indent=2))
+    _, _, tid, info = best
+    result = {"ticket": tid, "summary": info.get("summary", ""),
+              "priority": info.get("priority", "medium"),
+              "phase": info.get("phase", 1),
+              "blocked_by": info.get("blocked_by", [])}
+    if orjson is not None:
+        encoded = orjson.dumps(result, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+        buf = getattr(sys.stdout, "buffer", None)  # absent when stdout is redirected to a text stream
+        if buf is None:
+            sys.stdout.write(encoded.decode())
+        else:
+            sys.stdout.flush()
+            buf.write(encoded)
+    else:
+        print(json.dumps(result, indent=2))
     return 0
 
 
@@ -270,32 +397,36 @@ def cmd_depends(ticket_id: str, depends_on_id: str) -> int:
         print(f"Dependency already exists: {ticket_id} blocked by {depends_on_id}")
         return 0
 
+    graph = data.get("dependency_graph", {})
+    incremental = ticket_id in graph and depends_on_id in graph
+    if incremental:
+        # The edge closes a cycle only if depends_on_id already reaches ticket_id
+        path = _dependency_path(graph, depends_on_id, ticket_id)
+        cycle = [ticket_id] + path if path else None
+    else:
+        # Validate against a trial graph so a rejected edge leaves the loaded state untouched
+        cycle, depths, phases = analyze_graph({**graph, ticket_id: blocked_by + [depends_on_id]})
+    if cycle:
+        print(f"Error: Would create cycle: {' -> '.join(cycle)}", file=sys.stderr)
+        return 2
+
     blocked_by.append(depends_on_id)
     tickets[ticket_id]["blocked_by"] = blocked_by
     blocks = tickets[depends_on_id].get("blocks", [])
     if ticket_id not in blocks:
         blocks.append(ticket_id)
         tickets[depends_on_id]["blocks"] = blocks
-
-    graph = data.get("dependency_graph", {})
     graph[ticket_id] = blocked_by
     data["dependency_graph"] = graph
 
-    cycle = detect_cycle(graph)
-    if cycle:
-        blocked_by.remove(depends_on_id)
-        if ticket_id in blocks:
-            blocks.remove(ticket_id)
-        graph[ticket_id] = blocked_by
-        print(f"Error: Would create cycle: {' -> '.join(cycle)}", file=sys.stderr)
-        return 2
-
-    depths = compute_depth(graph)
-    for tid, d in depths.items():
-        if tid in tickets:
-            tickets[tid]["depth"] = d
-            tickets[tid]["phase"] = d + 1
-    data["phases"] = compute_phases(graph)
+    if incremental:
+        _raise_depths(data, ticket_id, tickets[depends_on_id].get("depth", 0) + 1)
+    else:
+        for tid, d in depths.items():
+            if tid in tickets:
+                tickets[tid]["depth"] = d
+                tickets[tid]["phase"] = d + 1
+        data["phases"] = phases
     save_status(data)
     print(f"Added dependency: {ticket_id} blocked by {depends_on_id}")
     return 0
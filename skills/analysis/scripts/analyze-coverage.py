@@ -12,17 +12,51 @@ Usage:
 
 import argparse
 import json
+import os
 import sys
-from pathlib import Path
-from typing import Any
+from operator import itemgetter
+from typing import Any, Callable
+
+try:
+    import orjson
+except ImportError:  # optional accelerator; stdlib json is the fallback
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # optional; large reports are loaded whole without it
+    ijson = None
+
+# Reports above this size are streamed with ijson, keeping only the fields used below
+STREAM_THRESHOLD_BYTES = 32 * 1024 * 1024
+WRITE_BUFFER_SIZE = 1 << 20
+FILE_FIELDS = ("missing_lines", "covered_lines", "num_statements")
+JSON_ERRORS = (json.JSONDecodeError,) if ijson is None else (json.JSONDecodeError, ijson.JSONError)
 
 
 def load_coverage_report(path: str) -> dict[str, Any]:
     """Load coverage.json from pytest-cov."""
-    with open(path) as f:
+    if ijson is not None and os.path.getsize(path) > STREAM_THRESHOLD_BYTES:
+        return stream_coverage_report(path)
+    if orjson is not None:
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+    with open(path, encoding="utf-8") as f:
         return json.load(f)
 
 
+def stream_coverage_report(path: str) -> dict[str, Any]:
+    """Load totals and per-file counts without materializing the full report."""
+    with open(path, "rb") as f:
+        files = {
+            file_path: {k: data[k] for k in FILE_FIELDS if k in data}
+            for file_path, data in ijson.kvitems(f, "files", use_float=True)
+        }
+        f.seek(0)
+        totals = next(ijson.items(f, "totals", use_float=True), {})
+    return {"totals": totals, "files": files}
+
+
 def calculate_overall_coverage(report: dict[str, Any]) -> float:
     """Calculate overall coverage percentage."""
     totals = report.get("totals", {})
@@ -31,6 +65,15 @@ def calculate_overall_coverage(report: dict[str, Any]) -> float:
     return round((covered / total) * 100, 2)
 
 
+DEFAULT_PRIORITY_PATTERNS = {
+    "P0": ["error", "auth", "security", "exception"],
+    "P1": ["service", "repository", "handler"],
+    "P2": ["util", "helper", "route"],
+    "P3": ["config", "constant", "model"],
+}
+PRIORITY_ORDER = {"P0": 0, "P1": 1, "P2": 2, "P3": 3}
+
+
 def get_uncovered_lines(report: dict[str, Any]) -> dict[str, list[int]]:
     """Extract uncovered lines per file."""
     files = report.get("files", {})
@@ -44,9 +87,58 @@ def get_uncovered_lines(report: dict[str, Any]) -> dict[str, list[int]]:
     return uncovered
 
 
+def _flatten_patterns(priority_patterns: dict[str, list[str]]) -> tuple[tuple[str, str], ...]:
+    """(priority, pattern) pairs in priority order, so the first hit wins."""
+    return tuple((p, pattern) for p, patterns in priority_patterns.items() for pattern in patterns)
+
+
+DEFAULT_FLAT_PATTERNS = _flatten_patterns(DEFAULT_PRIORITY_PATTERNS)
+
+
+def _first_hit(text: str, flat_patterns: tuple[tuple[str, str], ...], limit: int) -> int:
+    """Index of the first pattern before ``limit`` found in text, else ``limit``."""
+    for i in range(limit):
+        if flat_patterns[i][1] in text:
+            return i
+    return limit
+
+
+def _priority_lookup(flat_patterns: tuple[tuple[str, str], ...]) -> Callable[[str], str]:
+    """
+    Return a file_path -> priority function that scans each directory once.
+
+    A pattern without a separator lies wholly in the directory part or the
+    basename, so the first hit on the full path is the earlier of the two.
+    """
+    n = len(flat_patterns)
+    dir_hits: dict[str, int] = {}
+    splittable = not any("/" in pattern or "\\" in pattern for _, pattern in flat_patterns)
+
+    def lookup(file_path: str) -> str:
+        file_lower = file_path.lower()
+        if splittable:
+            directory, _, base = file_lower.replace("\\", "/").rpartition("/")
+            hit = dir_hits.get(directory)
+            if hit is None:
+                hit = dir_hits[directory] = _first_hit(directory, flat_patterns, n)
+            hit = _first_hit(base, flat_patterns, hit)
+        else:
+            hit = _first_hit(file_lower, flat_patterns, n)
+        return flat_patterns[hit][0] if hit < n else "P2"  # Default
+
+    return lookup
+
+
+def _sort_gaps(gaps: list[dict[str, Any]]) -> None:
+    """Sort by priority then by line count."""
+    # Two stable sorts: line count first, then priority rank
+    gaps.sort(key=itemgetter("line_count"), reverse=True)
+    gaps.sort(key=lambda gap: PRIORITY_ORDER[gap["priority"]])
+
+
 def prioritize_gaps(
     uncovered: dict[str, list[int]],
-    priority_patterns: dict[str, str] | None = None
+    priority_patterns: dict[str, list[str]] | None = None
 ) -> list[dict[str, Any]]:
     """
     Prioritize coverage gaps by importance.
@@ -58,58 +150,38 @@ def prioritize_gaps(
     - P3: Configuration, constants
     """
     if priority_patterns is None:
-        priority_patterns = {
-            "P0": ["error", "auth", "security", "exception"],
-            "P1": ["service", "repository", "handler"],
-            "P2": ["util", "helper", "route"],
-            "P3": ["config", "constant", "model"],
-        }
+        flat_patterns = DEFAULT_FLAT_PATTERNS
+    else:
+        flat_patterns = _flatten_patterns(priority_patterns)
+    priority_of = _priority_lookup(flat_patterns)
 
     gaps = []
-
     for file_path, lines in uncovered.items():
-        file_lower = file_path.lower()
-
-        # Determine priority
-        priority = "P2"  # Default
-        for p, patterns in priority_patterns.items():
-            if any(pattern in file_lower for pattern in patterns):
-                priority = p
-                break
-
-        gaps.append({
-            "file": file_path,
-            "lines": lines,
-            "line_count": len(lines),
-            "priority": priority,
-        })
-
-    # Sort by priority then by line count
-    priority_order = {"P0": 0, "P1": 1, "P2": 2, "P3": 3}
-    gaps.sort(key=lambda x: (priority_order[x["priority"]], -x["line_count"]))
+        gap = _tally_file(file_path, {"missing_lines": lines}, None, priority_of)
+        if gap is not None:
+            gaps.append(gap)
+    _sort_gaps(gaps)
 
     return gaps
 
 
-def get_coverage_by_directory(report: dict[str, Any]) -> dict[str, float]:
-    """Calculate coverage percentage per directory."""
-    files = report.get("files", {})
-    dir_stats: dict[str, dict[str, int]] = {}
+def _normalize_path(file_path: str) -> str:
+    """Use "/" separators (coverage.py writes native paths on Windows) and drop leading "./"."""
+    file_path = file_path.replace("\\", "/")
+    while file_path.startswith("./"):
+        file_path = file_path[2:]
+    return file_path
 
-    for file_path, data in files.items():
-        # Get directory (use first two levels)
-        parts = Path(file_path).parts
-        if len(parts) >= 2:
-            directory = str(Path(parts[0]) / parts[1])
-        else:
-            directory = parts[0] if parts else "root"
 
-        if directory not in dir_stats:
-            dir_stats[directory] = {"covered": 0, "total": 0}
+def _directory_of(file_path: str) -> str:
+    """Get directory (use first two levels)."""
+    parts = _normalize_path(file_path).split("/", 2)
+    if len(parts) >= 2:
+        return parts[0] + "/" + parts[1]
+    return parts[0] or "root"
 
-        dir_stats[directory]["covered"] += data.get("covered_lines", 0)
-        dir_stats[directory]["total"] += data.get("num_statements", 0)
 
+def _directory_coverage(dir_stats: dict[str, dict[str, int]]) -> dict[str, float]:
     coverage_by_dir = {}
     for directory, stats in dir_stats.items():
         if stats["total"] > 0:
@@ -120,22 +192,67 @@ def get_coverage_by_directory(report: dict[str, Any]) -> dict[str, float]:
     return dict(sorted(coverage_by_dir.items(), key=lambda x: x[1]))
 
 
+def _tally_file(
+    file_path: str,
+    data: dict[str, Any],
+    dir_stats: dict[str, dict[str, int]] | None,
+    priority_of: Callable[[str], str] | None,
+) -> dict[str, Any] | None:
+    """Add one file to dir_stats (if given) and return its prioritized gap, if any."""
+    if dir_stats is not None:
+        directory = _directory_of(file_path)
+        stats = dir_stats.get(directory)
+        if stats is None:
+            stats = dir_stats[directory] = {"covered": 0, "total": 0}
+        stats["covered"] += data.get("covered_lines", 0)
+        stats["total"] += data.get("num_statements", 0)
+
+    missing = data.get("missing_lines", [])
+    if priority_of is None or not missing:
+        return None
+    return {
+        "file": file_path,
+        "lines": missing,
+        "line_count": len(missing),
+        "priority": priority_of(file_path),
+    }
+
+
+def get_coverage_by_directory(report: dict[str, Any]) -> dict[str, float]:
+    """Calculate coverage percentage per directory."""
+    files = report.get("files", {})
+    dir_stats: dict[str, dict[str, int]] = {}
+
+    for file_path, data in files.items():
+        _tally_file(file_path, data, dir_stats, None)
+
+    return _directory_coverage(dir_stats)
+
+
 def generate_report(
     report: dict[str, Any],
     threshold: float = 80.0
 ) -> dict[str, Any]:
     """Generate comprehensive coverage analysis report."""
     overall = calculate_overall_coverage(report)
-    uncovered = get_uncovered_lines(report)
-    gaps = prioritize_gaps(uncovered)
-    by_directory = get_coverage_by_directory(report)
+    priority_of = _priority_lookup(DEFAULT_FLAT_PATTERNS)
+    gaps: list[dict[str, Any]] = []
+    dir_stats: dict[str, dict[str, int]] = {}
+    priority_counts = {"P0": 0, "P1": 0, "P2": 0, "P3": 0}
+    total_uncovered = 0
 
-    status = "PASS" if overall >= threshold else "FAIL"
+    # Single pass over files: directory totals, prioritized gaps and gap tallies together
+    for file_path, data in report.get("files", {}).items():
+        gap = _tally_file(file_path, data, dir_stats, priority_of)
+        if gap is not None:
+            priority_counts[gap["priority"]] += 1
+            total_uncovered += gap["line_count"]
+            gaps.append(gap)
 
-    # Count by priority
-    priority_counts = {"P0": 0, "P1": 0, "P2": 0, "P3": 0}
-    for gap in gaps:
-        priority_counts[gap["priority"]] += 1
+    _sort_gaps(gaps)
+    by_directory = _directory_coverage(dir_stats)
+
+    status = "PASS" if overall >= threshold else "FAIL"
 
     return {
         "overall_coverage": overall,
@@ -146,7 +263,7 @@ def generate_report(
         "gaps": gaps,
         "summary": {
             "total_files_with_gaps": len(gaps),
-            "total_uncovered_lines": sum(g["line_count"] for g in gaps),
+            "total_uncovered_lines": total_uncovered,
             "critical_gaps": priority_counts["P0"],
             "high_priority_gaps": priority_counts["P1"],
         }
@@ -155,43 +272,46 @@ def generate_report(
 
 def print_report(analysis: dict[str, Any], verbose: bool = False) -> None:
     """Print coverage analysis to console."""
-    print("=" * 60)
-    print("COVERAGE ANALYSIS REPORT")
-    print("=" * 60)
+    buf: list[str] = []
+    w = buf.append
+    w("=" * 60 + "\n")
+    w("COVERAGE ANALYSIS REPORT\n")
+    w("=" * 60 + "\n")
 
     # Overall status
     status_emoji = "✅" if analysis["status"] == "PASS" else "❌"
-    print(f"\nOverall Coverage: {analysis['overall_coverage']}%")
-    print(f"Target: {analysis['target']}%")
-    print(f"Status: {status_emoji} {analysis['status']}")
+    w(f"\nOverall Coverage: {analysis['overall_coverage']}%\n")
+    w(f"Target: {analysis['target']}%\n")
+    w(f"Status: {status_emoji} {analysis['status']}\n")
 
     # Summary
     summary = analysis["summary"]
-    print(f"\nGap Summary:")
-    print(f"  Files with gaps: {summary['total_files_with_gaps']}")
-    print(f"  Uncovered lines: {summary['total_uncovered_lines']}")
-    print(f"  Critical (P0): {summary['critical_gaps']}")
-    print(f"  High (P1): {summary['high_priority_gaps']}")
+    w("\nGap Summary:\n")
+    w(f"  Files with gaps: {summary['total_files_with_gaps']}\n")
+    w(f"  Uncovered lines: {summary['total_uncovered_lines']}\n")
+    w(f"  Critical (P0): {summary['critical_gaps']}\n")
+    w(f"  High (P1): {summary['high_priority_gaps']}\n")
 
     # Coverage by directory
-    print("\nCoverage by Directory:")
+    w("\nCoverage by Directory:\n")
     for directory, coverage in analysis["by_directory"].items():
         indicator = "✅" if coverage >= analysis["target"] else "⚠️"
-        print(f"  {indicator} {directory}: {coverage}%")
+        w(f"  {indicator} {directory}: {coverage}%\n")
 
     # Priority gaps
     if analysis["gaps"]:
-        print("\nPriority Gaps:")
+        w("\nPriority Gaps:\n")
         for priority in ["P0", "P1", "P2", "P3"]:
             priority_gaps = [g for g in analysis["gaps"] if g["priority"] == priority]
             if priority_gaps:
-                print(f"\n  {priority} ({len(priority_gaps)} files):")
+                w(f"\n  {priority} ({len(priority_gaps)} files):\n")
                 for gap in priority_gaps[:5]:  # Show top 5 per priority
-                    print(f"    - {gap['file']} ({gap['line_count']} lines)")
+                    w(f"    - {gap['file']} ({gap['line_count']} lines)\n")
                 if len(priority_gaps) > 5:
-                    print(f"    ... and {len(priority_gaps) - 5} more")
+                    w(f"    ... and {len(priority_gaps) - 5} more\n")
 
-    print("\n" + "=" * 60)
+    w("\n" + "=" * 60 + "\n")
+    sys.stdout.write("".join(buf))
 
 
 def main() -> int:
@@ -226,7 +346,7 @@ def main() -> int:
     args = parser.parse_args()
 
     # Check file exists
-    if not Path(args.coverage_file).exists():
+    if not os.path.exists(args.coverage_file):
         print(f"Error: Coverage file not found: {args.coverage_file}")
         print("\nGenerate with: pytest --cov=src --cov-report=json")
         return 1
@@ -242,8 +362,12 @@ def main() -> int:
             ]
 
         if args.output:
-            with open(args.output, "w") as f:
-                json.dump(analysis, f, indent=2)
+            if orjson is not None:
+                with open(args.output, "wb", buffering=WRITE_BUFFER_SIZE) as f:
+                    f.write(orjson.dumps(analysis, option=orjson.OPT_INDENT_2))
+            else:
+                with open(args.output, "w", encoding="utf-8", buffering=WRITE_BUFFER_SIZE) as f:
+                    json.dump(analysis, f, indent=2)
             print(f"Report saved to: {args.output}")
 
         print_report(analysis, args.verbose)
@@ -251,7 +375,7 @@ def main() -> int:
         # Exit with error if below threshold
         return 0 if analysis["status"] == "PASS" else 1
 
-    except json.JSONDecodeError as e:
+    except JSON_ERRORS as e:
         print(f"Error: Invalid JSON in coverage file: {e}")
         return 1
     except KeyError as e:
@@ -3,14 +3,51 @@
 
 import argparse
 import ast
+import heapq
 import json
+import os
+import re
 import sys
-from dataclasses import dataclass, field
+import threading
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from operator import attrgetter, itemgetter
 from pathlib import Path
-from typing import Any
-
-
-@dataclass
+from typing import IO, Any, Iterator
+
+try:
+    import orjson
+except ImportError:  # optional accelerator; stdlib json is the fallback
+    orjson = None
+
+# Below this many files a process pool costs more to start than it saves
+PARALLEL_MIN_FILES = 64
+POOL_CHUNKSIZE = 32
+# Directories never worth descending into, whatever the exclude patterns say
+_SKIP_DIRS = frozenset({"__pycache__", ".git", ".venv", "node_modules"})
+# Bump whenever analyze_file output changes so stale --cache entries are ignored
+CACHE_VERSION = 3
+
+# Sort rank per severity; issues carry it as "_sev" until the report is built
+SEVERITY_ORDER = {"critical": 0, "high": 1, "medium": 2, "low": 3}
+
+# Fixed complexity increment per node type; BoolOp and comprehension vary per node
+_CC_INCREMENT: dict[type, int] = {
+    ast.If: 1, ast.While: 1, ast.For: 1, ast.AsyncFor: 1,
+    ast.ExceptHandler: 1, ast.IfExp: 1,
+}
+# Node types that open a nesting level
+_NESTING_TYPES = frozenset({ast.If, ast.While, ast.For, ast.AsyncFor, ast.With, ast.AsyncWith, ast.Try})
+# Fields holding only operator/context singletons, never statements or expressions
+_LEAF_FIELDS = frozenset({"ctx", "op", "ops"})
+_CHILD_FIELDS: dict[type, tuple[str, ...]] = {}
+# Top-level statement kinds counted per file
+_FUNCTION_TYPES = (ast.FunctionDef, ast.AsyncFunctionDef)
+_IMPORT_TYPES = (ast.Import, ast.ImportFrom)
+
+
+@dataclass(slots=True)
 class FunctionMetrics:
     """Metrics for a single function."""
     name: str
@@ -23,7 +60,7 @@ class FunctionMetrics:
     cognitive_complexity: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class FileMetrics:
     """Metrics for a single file."""
     path: str
@@ -39,17 +76,34 @@ class FileMetrics:
 class ComplexityVisitor(ast.NodeVisitor):
     """AST visitor to calculate code complexity metrics."""
 
-    def __init__(self, file_path: str):
-        self.file_path = file_path
+    def __init__(self, file_path: str, file_metrics: FileMetrics | None = None):
         self.functions: list[FunctionMetrics] = []
         self.current_function: FunctionMetrics | None = None
         self.nesting_level = 0
+        self.reset(file_path, file_metrics)
 
-    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
-        self._analyze_function(node)
-
-    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef) -> None:
-        self._analyze_function(node)
+    def reset(self, file_path: str, file_metrics: FileMetrics | None = None) -> None:
+        """Point the visitor at another file so one instance serves a whole run."""
+        self.file_path = file_path
+        # Issues and max_complexity are recorded here as each function is measured
+        if file_metrics is None:
+            file_metrics = FileMetrics(path=file_path)
+        self.file_metrics: FileMetrics | None = file_metrics
+        self.functions.clear()
+        self.total_complexity = 0
+
+    def release(self) -> None:
+        """Drop references to the last file so a reused visitor does not keep it alive."""
+        self.file_metrics = None
+        self.functions.clear()
+
+    def visit(self, node: ast.AST) -> None:
+        # Only function nodes are measured, so skip NodeVisitor's per-node "visit_" name lookup
+        t = type(node)
+        if t is ast.FunctionDef or t is ast.AsyncFunctionDef:
+            self._analyze_function(node)
+        else:
+            self.generic_visit(node)
 
     def _analyze_function(self, node: ast.FunctionDef | ast.AsyncFunctionDef) -> None:
         metrics = FunctionMetrics(
@@ -58,127 +112,219 @@ class ComplexityVisitor(ast.NodeVisitor):
         )
         if node.end_lineno:
             metrics.lines_of_code = node.end_lineno - node.lineno + 1
-        metrics.cyclomatic_complexity = self._calculate_complexity(node)
-        metrics.nesting_depth = self._calculate_nesting(node)
+        metrics.cyclomatic_complexity, metrics.nesting_depth = self._measure(node)
         self.functions.append(metrics)
+        self._record(metrics)
         self.generic_visit(node)
 
-    def _calculate_complexity(self, node: ast.AST) -> int:
-        """Calculate cyclomatic complexity."""
-        complexity = 1
-        for child in ast.walk(node):
-            if isinstance(child, (ast.If, ast.While, ast.For, ast.AsyncFor)):
-                complexity += 1
-            elif isinstance(child, ast.ExceptHandler):
-                complexity += 1
-            elif isinstance(child, (ast.And, ast.Or)):
-                complexity += 1
-            elif isinstance(child, ast.comprehension):
-                complexity += 1
-                if child.ifs:
-                    complexity += len(child.ifs)
-            elif isinstance(child, ast.Assert):
-                complexity += 1
-            elif isinstance(child, ast.IfExp):
-                complexity += 1
-        return complexity
-
-    def _calculate_nesting(self, node: ast.AST) -> int:
-        """Calculate maximum nesting depth."""
-        max_depth = 0
-
-        def _walk(n: ast.AST, depth: int) -> None:
-            nonlocal max_depth
-            max_depth = max(max_depth, depth)
-            for child in ast.iter_child_nodes(n):
-                if isinstance(child, (ast.If, ast.While, ast.For,
-                                     ast.AsyncFor, ast.With, ast.AsyncWith,
-                                     ast.Try)):
-                    _walk(child, depth + 1)
-                else:
-                    _walk(child, depth)
-
-        _walk(node, 0)
-        return max_depth
-
-
-def analyze_file(file_path: Path) -> FileMetrics | None:
-    """Analyze a single Python file."""
-    try:
-        content = file_path.read_text()
-        tree = ast.parse(content)
-    except (SyntaxError, Exception):
-        return None
-
-    metrics = FileMetrics(path=str(file_path))
-    metrics.lines_of_code = len(content.splitlines())
-
-    for node in ast.iter_child_nodes(tree):
-        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-            metrics.functions += 1
-        elif isinstance(node, ast.ClassDef):
-            metrics.classes += 1
-        elif isinstance(node, (ast.Import, ast.ImportFrom)):
-            metrics.imports += 1
-
-    visitor = ComplexityVisitor(str(file_path))
-    visitor.visit(tree)
-
-    if visitor.functions:
-        complexities = [f.cyclomatic_complexity for f in visitor.functions]
-        metrics.avg_complexity = sum(complexities) / len(complexities)
-        metrics.max_complexity = max(complexities)
-
-    for func in visitor.functions:
+    def _record(self, func: FunctionMetrics) -> None:
+        """Fold one function into the file totals and raise its threshold issues."""
+        fm = self.file_metrics
+        self.total_complexity += func.cyclomatic_complexity
+        if func.cyclomatic_complexity > fm.max_complexity:
+            fm.max_complexity = func.cyclomatic_complexity
         if func.cyclomatic_complexity > 10:
-            metrics.issues.append({
+            severity = "high" if func.cyclomatic_complexity > 15 else "medium"
+            fm.issues.append({
                 "type": "high_complexity", "function": func.name,
                 "line": func.line, "value": func.cyclomatic_complexity,
                 "threshold": 10,
-                "severity": "high" if func.cyclomatic_complexity > 15 else "medium"
+                "severity": severity, "_sev": SEVERITY_ORDER[severity]
             })
         if func.lines_of_code > 50:
-            metrics.issues.append({
+            severity = "high" if func.lines_of_code > 100 else "medium"
+            fm.issues.append({
                 "type": "long_function", "function": func.name,
                 "line": func.line, "value": func.lines_of_code,
                 "threshold": 50,
-                "severity": "high" if func.lines_of_code > 100 else "medium"
+                "severity": severity, "_sev": SEVERITY_ORDER[severity]
             })
         if func.parameters > 5:
-            metrics.issues.append({
+            fm.issues.append({
                 "type": "too_many_parameters", "function": func.name,
                 "line": func.line, "value": func.parameters,
-                "threshold": 5, "severity": "medium"
+                "threshold": 5, "severity": "medium", "_sev": SEVERITY_ORDER["medium"]
             })
         if func.nesting_depth > 3:
-            metrics.issues.append({
+            fm.issues.append({
                 "type": "deep_nesting", "function": func.name,
                 "line": func.line, "value": func.nesting_depth,
-                "threshold": 3, "severity": "medium"
+                "threshold": 3, "severity": "medium", "_sev": SEVERITY_ORDER["medium"]
             })
 
+    def _measure(self, node: ast.AST) -> tuple[int, int]:
+        """Return (cyclomatic complexity, maximum nesting depth) of a function body."""
+        cc = 1
+        max_depth = 0
+        stack = [(node, 0)]
+        pop = stack.pop
+        push = stack.append
+        while stack:
+            node, depth = pop()
+            t = type(node)
+            inc = _CC_INCREMENT.get(t, 0)
+            if inc:
+                cc += inc
+            elif t is ast.BoolOp:
+                cc += len(node.values) - 1
+            elif t is ast.comprehension:
+                cc += 1 + len(node.ifs)
+            if t in _NESTING_TYPES:
+                depth += 1
+            if depth > max_depth:
+                max_depth = depth
+            fields = _CHILD_FIELDS.get(t)
+            if fields is None:
+                fields = _CHILD_FIELDS[t] = tuple(f for f in t._fields if f not in _LEAF_FIELDS)
+            for name in fields:
+                value = getattr(node, name, None)
+                if type(value) is list:
+                    for child in value:
+                        if isinstance(child, ast.AST):
+                            push((child, depth))
+                elif isinstance(value, ast.AST):
+                    push((value, depth))
+        return cc, max_depth
+
+
+# analyze_file reuses one visitor per thread; pool workers each have their own module copy
+_local = threading.local()
+
+
+def analyze_file(file_path: Path) -> FileMetrics | None:
+    """Analyze a single Python file."""
+    try:
+        content = file_path.read_bytes()
+    except OSError as e:
+        print(f"Warning: Cannot read {file_path}: {e}", file=sys.stderr)
+        return None
+    try:
+        tree = ast.parse(content, filename=str(file_path))
+    except (SyntaxError, ValueError, RecursionError) as e:  # bad encodings, null bytes, absurd nesting
+        print(f"Warning: Skipping unparseable {file_path}: {e}", file=sys.stderr)
+        return None
+
+    metrics = FileMetrics(path=str(file_path))
+    metrics.lines_of_code = content.count(b"\n") + (1 if content and not content.endswith(b"\n") else 0)
+
+    for node in ast.iter_child_nodes(tree):
+        if isinstance(node, _FUNCTION_TYPES):
+            metrics.functions += 1
+        elif isinstance(node, ast.ClassDef):
+            metrics.classes += 1
+        elif isinstance(node, _IMPORT_TYPES):
+            metrics.imports += 1
+
+    visitor = getattr(_local, "visitor", None)
+    if visitor is None:
+        visitor = _local.visitor = ComplexityVisitor(metrics.path, metrics)
+    else:
+        visitor.reset(metrics.path, metrics)
+    try:
+        visitor.visit(tree)
+        if visitor.functions:
+            metrics.avg_complexity = visitor.total_complexity / len(visitor.functions)
+    finally:
+        visitor.release()
+
     if metrics.lines_of_code > 500:
         metrics.issues.append({
             "type": "long_file", "line": 1,
-            "value": metrics.lines_of_code, "threshold": 500, "severity": "medium"
+            "value": metrics.lines_of_code, "threshold": 500,
+            "severity": "medium", "_sev": SEVERITY_ORDER["medium"]
         })
 
     return metrics
 
 
-def analyze_directory(directory: Path, exclude_patterns: list[str] | None = None) -> list[FileMetrics]:
-    """Analyze all Python files in directory."""
+def _iter_python_files(directory: Path, exclude_patterns: list[str]) -> Iterator[Path]:
+    """Yield .py files under directory, pruning skipped and excluded directories rather than descending."""
+    excluded = re.compile("|".join(map(re.escape, exclude_patterns))).search if exclude_patterns else None
+    # Patterns spanning a separator are matched against the path relative to directory
+    path_patterns = [p for p in exclude_patterns if os.sep in p]
+    for root, dirnames, filenames in os.walk(directory):
+        dirnames[:] = [d for d in dirnames if d not in _SKIP_DIRS and not (excluded and excluded(d))]
+        rel_root = os.path.relpath(root, directory) if path_patterns else ""
+        for name in filenames:
+            if not name.endswith(".py") or (excluded and excluded(name)):
+                continue
+            if path_patterns:
+                rel = name if rel_root == os.curdir else os.path.join(rel_root, name)
+                if any(p in rel for p in path_patterns):
+                    continue
+            yield Path(os.path.join(root, name))
+
+
+def _load_cache(cache_path: str) -> dict[str, Any]:
+    """Load per-file cache entries, or nothing if the cache is missing, corrupt or outdated."""
+    try:
+        with open(cache_path) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+        return {}
+    return data.get("files", {})
+
+
+def _save_cache(cache_path: str, entries: dict[str, Any]) -> None:
+    """Atomically write cache entries; a failed write only costs the next run a re-parse."""
+    tmp = cache_path + ".tmp"
+    try:
+        with open(tmp, "w") as f:
+            json.dump({"version": CACHE_VERSION, "files": entries}, f, separators=(",", ":"))
+        os.replace(tmp, cache_path)
+    except OSError as e:
+        print(f"Warning: Cannot write cache {cache_path}: {e}", file=sys.stderr)
+
+
+def _analyze_files(files: list[Path], jobs: int | None) -> list[FileMetrics | None]:
+    """Run analyze_file over files, in a process pool when it pays off."""
+    if jobs is not None and jobs < 1:
+        raise ValueError(f"jobs must be at least 1, got {jobs}")
+    workers = jobs if jobs is not None else os.cpu_count() or 1
+    if workers == 1 or len(files) < PARALLEL_MIN_FILES:
+        return list(map(analyze_file, files))
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        return list(ex.map(analyze_file, files, chunksize=POOL_CHUNKSIZE))
+
+
+def analyze_directory(directory: Path, exclude_patterns: list[str] | None = None,
+                      jobs: int | None = None, cache_path: str | None = None) -> list[FileMetrics]:
+    """Analyze all Python files in directory, across `jobs` processes (default: all CPUs).
+
+    With cache_path, files whose mtime and size are unchanged since the last run
+    reuse their stored metrics instead of being parsed again.
+    """
     if exclude_patterns is None:
         exclude_patterns = ["test_", "_test.py", "conftest.py", "__pycache__"]
 
-    results = []
-    for py_file in directory.rglob("*.py"):
-        if any(p in str(py_file) for p in exclude_patterns):
-            continue
-        metrics = analyze_file(py_file)
-        if metrics:
-            results.append(metrics)
-    return results
+    files = list(_iter_python_files(directory, exclude_patterns))
+    results: dict[str, FileMetrics | None] = {}
+    keys: dict[str, list[int]] = {}
+    if cache_path:
+        cache = _load_cache(cache_path)
+        for py_file in files:
+            path = str(py_file)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            keys[path] = key = [st.st_mtime_ns, st.st_size]
+            entry = cache.get(path)
+            if entry and entry["key"] == key:
+                results[path] = FileMetrics(**entry["metrics"])
+
+    pending = [py_file for py_file in files if str(py_file) not in results]
+    for py_file, metrics in zip(pending, _analyze_files(pending, jobs)):
+        results[str(py_file)] = metrics
+
+    if cache_path:
+        _save_cache(cache_path, {
+            path: {"key": keys[path], "metrics": asdict(m)}
+            for path, m in results.items() if m and path in keys
+        })
+    return [m for m in map(results.get, map(str, files)) if m]
 
 
 def generate_report(metrics: list[FileMetrics], complexity_threshold: int = 10) -> dict[str, Any]:
@@ -187,21 +333,29 @@ def generate_report(metrics: list[FileMetrics], complexity_threshold: int = 10)
     total_functions = sum(m.functions for m in metrics)
     total_classes = sum(m.classes for m in metrics)
 
-    all_issues: list[dict[str, Any]] = []
+    ranked: list[dict[str, Any]] = []
     for m in metrics:
         for issue in m.issues:
             issue["file"] = m.path
-            all_issues.append(issue)
+            # Issues built elsewhere may lack the rank; derive it as the severity sort would
+            if "_sev" not in issue:
+                issue["_sev"] = SEVERITY_ORDER.get(issue.get("severity", "low"), 3)
+            ranked.append(issue)
 
-    severity_order = {"critical": 0, "high": 1, "medium": 2, "low": 3}
-    all_issues.sort(key=lambda x: severity_order.get(x.get("severity", "low"), 3))
+    ranked.sort(key=itemgetter("_sev"))
 
-    issue_types: dict[str, int] = {}
-    for issue in all_issues:
-        t = issue["type"]
-        issue_types[t] = issue_types.get(t, 0) + 1
+    # The report gets copies without the rank, leaving FileMetrics.issues reusable
+    all_issues: list[dict[str, Any]] = []
+    issue_types: Counter[str] = Counter()
+    severity_counts: Counter[str | None] = Counter()
+    for issue in ranked:
+        issue_types[issue["type"]] += 1
+        severity_counts[issue.get("severity")] += 1
+        issue = issue.copy()
+        del issue["_sev"]
+        all_issues.append(issue)
 
-    complex_files = sorted(metrics, key=lambda m: m.max_complexity, reverse=True)[:10]
+    complex_files = heapq.nlargest(10, metrics, key=attrgetter("max_complexity"))
 
     return {
         "summary": {
@@ -211,12 +365,12 @@ def generate_report(metrics: list[FileMetrics], complexity_threshold: int = 10)
             "total_classes": total_classes,
             "total_issues": len(all_issues),
             "issues_by_severity": {
-                "high": len([i for i in all_issues if i.get("severity") == "high"]),
-                "medium": len([i for i in all_issues if i.get("severity") == "medium"]),
-                "low": len([i for i in all_issues if i.get("severity") == "low"]),
+                "high": severity_counts["high"],
+                "medium": severity_counts["medium"],
+                "low": severity_counts["low"],
             }
         },
-        "issue_types": issue_types,
+        "issue_types": dict(issue_types),
         "issues": all_issues,
         "complex_files": [
             {"file": f.path, "max_complexity": f.max_complexity,
@@ -230,6 +384,41 @@ def generate_report(metrics: list[FileMetrics], complexity_threshold: int = 10)
     }
 
 
+_encode_str = json.encoder.encode_basestring_ascii
+_encode_value = json.JSONEncoder().encode
+_encode_indented = json.JSONEncoder(indent=2).encode
+
+
+def _encode_issue(issue: dict[str, Any]) -> str:
+    """Encode a flat issue dict as json.dump(indent=2) lays it out inside the issues array."""
+    return "{\n      " + ",\n      ".join([
+        _encode_str(k) + ": " + (_encode_str(v) if type(v) is str else _encode_value(v))
+        for k, v in issue.items()
+    ]) + "\n    }"
+
+
+def write_report(report: dict[str, Any], f: IO[str]) -> None:
+    """Write report as json.dump(report, f, indent=2) would, one issue per write.
+
+    The stdlib encoder falls back to pure Python whenever indent is set, emitting
+    every token as a separate write; issues dominate large reports, so they are
+    laid out by hand with the C string encoder instead.
+    """
+    sep = "{\n  "
+    for key, value in report.items():
+        f.write(sep + _encode_str(key) + ": ")
+        sep = ",\n  "
+        if key == "issues" and value:
+            issues = iter(value)
+            f.write("[\n    " + _encode_issue(next(issues)))
+            for issue in issues:
+                f.write(",\n    " + _encode_issue(issue))
+            f.write("\n  ]")
+        else:
+            f.write(_encode_indented(value).replace("\n", "\n  "))
+    f.write("\n}" if report else "{}")
+
+
 def print_report(report: dict[str, Any]) -> None:
     """Print audit report to console."""
     s = report["summary"]
@@ -267,7 +456,11 @@ def main() -> int:
     parser.add_argument("--exclude", nargs="+",
                         default=["test_", "_test.py", "conftest.py", "__pycache__"],
                         help="Patterns to exclude")
+    parser.add_argument("--cache", help="JSON cache of per-file metrics reused across runs")
+    parser.add_argument("--jobs", type=int, help="Worker processes (default: CPU count, 1 to disable)")
     args = parser.parse_args()
+    if args.jobs is not None and args.jobs < 1:
+        parser.error("--jobs must be at least 1")
 
     directory = Path(args.directory)
     if not directory.exists():
@@ -277,7 +470,7 @@ def main() -> int:
         print(f"Error: Not a directory: {directory}")
         return 1
 
-    metrics = analyze_directory(directory, args.exclude)
+    metrics = analyze_directory(directory, args.exclude, args.jobs, args.cache)
     if not metrics:
         print("No Python files found to analyze")
         return 1
@@ -285,8 +478,12 @@ def main() -> int:
     report = generate_report(metrics, args.threshold)
 
     if args.output:
-        with open(args.output, "w") as f:
-            json.dump(report, f, indent=2)
+        if orjson is not None:
+            with open(args.output, "wb") as f:
+                f.write(orjson.dumps(report, option=orjson.OPT_INDENT_2))
+        else:
+            with open(args.output, "w") as f:
+                write_report(report, f)
         print(f"Report saved to: {args.output}")
 
     print_report(report)